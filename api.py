@@ -6,19 +6,19 @@ Collects posts from AI subreddits, analyzes sentiment, and enables topic search.
 
 import asyncio
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from fastapi import FastAPI, HTTPException, Query, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional, Any
 from datetime import datetime, timedelta
 from pathlib import Path
 import sqlite3
-import json
-import urllib.request
-import urllib.parse
+import time
 import aiohttp
+import orjson
 import re
 from datetime import datetime, date
 
@@ -65,7 +65,92 @@ FETCH_INTERVAL_MINUTES = 15
 MAX_POSTS_PER_FETCH = 25
 KEEP_MONTHS = 6
 
-app = FastAPI(title="Reddit Sentiment Analysis API")
+# List/search endpoints serve this pre-truncated snippet instead of the full
+# selftext (which can be many KB per row); /api/posts/{id} has the full text
+SNIPPET_LENGTH = 500
+
+# Cap on in-flight LLM requests; llama-server runs with --parallel/--cont-batching
+# so concurrent requests are coalesced into one batch server-side
+LLM_CONCURRENCY = 16
+_llm_semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
+
+# Separate, smaller cap for topic-summary completions. Concurrent summary
+# requests batch on the server like everything else; the gate just keeps a
+# burst of dashboard "analyze" clicks from starving the sentiment scorers.
+SUMMARY_CONCURRENCY = 4
+_summary_semaphore = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+
+# Cap on concurrent subreddit fetches to stay under Reddit's rate limits
+REDDIT_CONCURRENCY = 5
+_reddit_semaphore = asyncio.Semaphore(REDDIT_CONCURRENCY)
+
+# Circuit breaker: after a failed LLM call, skip further calls for a cooldown
+# window instead of paying the full timeout per post. Posts are stored with
+# sentiment=NULL and rescored by the background fetcher once the server is back.
+LLM_FAILURE_COOLDOWN_SECONDS = 60
+_llm_fail_until: float = 0.0
+
+
+def _trip_llm_breaker():
+    global _llm_fail_until
+    _llm_fail_until = time.monotonic() + LLM_FAILURE_COOLDOWN_SECONDS
+
+# /api/stats cache: the dashboard polls constantly but the data only changes
+# when the background fetcher ingests new posts
+STATS_CACHE_TTL_SECONDS = 60
+_stats_cache: Optional[dict] = None
+_stats_cached_at: float = 0.0
+_stats_lock = asyncio.Lock()
+
+
+def invalidate_stats_cache():
+    """Drop the cached /api/stats payload (called after new posts are written)"""
+    global _stats_cache
+    _stats_cache = None
+
+
+# Distribution/timeline cache, same rationale as the stats cache. Keyed by
+# (endpoint, subreddit, days) since those fully determine the response; the
+# key values come from client query params, so the size cap keeps arbitrary
+# (subreddit, days) combinations from growing the cache without bound.
+SENTIMENT_CACHE_TTL_SECONDS = 60
+SENTIMENT_CACHE_MAX_ENTRIES = 256
+_sentiment_cache: dict = {}
+_sentiment_cache_lock = asyncio.Lock()
+
+
+def invalidate_sentiment_cache():
+    """Drop cached distribution/timeline payloads (called after new posts)"""
+    _sentiment_cache.clear()
+
+
+async def _cached_sentiment_query(key: tuple, func, *args):
+    """Serve a distribution/timeline query from the TTL cache, or run it"""
+    async with _sentiment_cache_lock:
+        cached = _sentiment_cache.get(key)
+        if cached is not None and time.monotonic() - cached[1] < SENTIMENT_CACHE_TTL_SECONDS:
+            return cached[0]
+
+    # Query outside the lock so one slow miss doesn't block hits on other
+    # keys; a concurrent miss on the same key just runs the query twice
+    result = await asyncio.to_thread(func, *args)
+
+    async with _sentiment_cache_lock:
+        now = time.monotonic()
+        # Evict expired entries on insert, then the oldest if still at the
+        # cap (dict preserves insertion order, so the first key is oldest)
+        for k in [
+            k
+            for k, (_, cached_at) in _sentiment_cache.items()
+            if now - cached_at >= SENTIMENT_CACHE_TTL_SECONDS
+        ]:
+            del _sentiment_cache[k]
+        while len(_sentiment_cache) >= SENTIMENT_CACHE_MAX_ENTRIES:
+            del _sentiment_cache[next(iter(_sentiment_cache))]
+        _sentiment_cache[key] = (result, now)
+    return result
+
+app = FastAPI(title="Reddit Sentiment Analysis API", default_response_class=ORJSONResponse)
 
 # Enable CORS
 app.add_middleware(
@@ -88,6 +173,56 @@ app.mount("/css", StaticFiles(directory=str(CSS_DIR)), name="css")
 DB_PATH = BASE_DIR / "sentiment_analysis.db"
 LLAMA_SERVER_URL = "http://localhost:8080"
 
+# Compiled once: extracts the numeric score from an LLM completion
+_SCORE_RE = re.compile(r"[-+]?\d*\.?\d+")
+
+# Shared HTTP session (created in lifespan, closed on shutdown). One session
+# per application enables aiohttp's connection pool and keep-alives instead
+# of paying TCP setup on every request.
+_http_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Return the shared aiohttp session, creating it lazily if needed"""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=30),
+            connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=75),
+        )
+    return _http_session
+
+
+# Shared connection for the read endpoints. sqlite3 serializes access to a
+# connection internally, so the to_thread helpers can reuse one instead of
+# paying connect + pragma setup per request; writers keep their own
+# connections and WAL keeps readers from blocking them.
+_read_conn: Optional[sqlite3.Connection] = None
+
+
+def get_read_conn() -> sqlite3.Connection:
+    """Return the shared read connection, creating it lazily if needed"""
+    global _read_conn
+    if _read_conn is None:
+        _read_conn = sqlite3.connect(
+            DB_PATH,
+            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+            check_same_thread=False,
+        )
+    return _read_conn
+
+
+def connect_write() -> sqlite3.Connection:
+    """Open a write connection with the per-connection pragmas applied.
+
+    journal_mode=WAL persists in the database file, but synchronous is
+    per-connection and defaults to FULL; without NORMAL every batch commit
+    pays an extra fsync.
+    """
+    conn = sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
 
 # Pydantic models
 class Post(BaseModel):
@@ -189,6 +324,14 @@ def init_db():
     conn = sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
     cursor = conn.cursor()
 
+    # WAL lets the read-heavy API endpoints proceed while the background
+    # fetcher commits (journal_mode is persistent, the rest are tuning)
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA cache_size=-65536")
+
     # Main posts table
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS posts (
@@ -207,19 +350,44 @@ def init_db():
             sentiment TEXT,
             sentiment_score REAL,
             analyzed_at TIMESTAMP,
-            fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            selftext_snippet TEXT
         )
     """)
 
-    # FTS5 virtual table for full-text search
-    cursor.execute("""
+    # Migration: add the snippet column to databases created before it existed
+    cursor.execute("PRAGMA table_info(posts)")
+    if "selftext_snippet" not in [row[1] for row in cursor.fetchall()]:
+        cursor.execute("ALTER TABLE posts ADD COLUMN selftext_snippet TEXT")
+    cursor.execute(
+        "UPDATE posts SET selftext_snippet = substr(selftext, 1, ?) WHERE selftext_snippet IS NULL",
+        (SNIPPET_LENGTH,),
+    )
+
+    # FTS5 virtual table for full-text search. Porter stemming makes queries
+    # match word variants; the prefix index serves prefix queries without scans.
+    fts_ddl = """
         CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
             title,
             selftext,
             content='posts',
-            content_rowid='rowid'
+            content_rowid='rowid',
+            tokenize='porter unicode61',
+            prefix='2 3 4'
         )
-    """)
+    """
+
+    # Migration: rebuild FTS indexes created before the tokenizer options
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='posts_fts'")
+    existing_fts = cursor.fetchone()
+    if existing_fts and "tokenize" not in existing_fts[0]:
+        cursor.execute("DROP TABLE posts_fts")
+        cursor.execute(fts_ddl)
+        cursor.execute(
+            "INSERT INTO posts_fts(rowid, title, selftext) SELECT rowid, title, selftext FROM posts"
+        )
+    else:
+        cursor.execute(fts_ddl)
 
     # Triggers to keep FTS in sync
     cursor.execute("""
@@ -247,6 +415,20 @@ def init_db():
         CREATE INDEX IF NOT EXISTS idx_sentiment ON posts(sentiment)
     """)
 
+    # Composite indexes matching the hot query shapes: subreddit + recency
+    # (posts list, distribution) and the sentiment-filtered variants can be
+    # answered from the index without a table scan
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_posts_sub_created ON posts(subreddit, created_utc DESC)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_posts_created_desc ON posts(created_utc DESC)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_posts_sub_sent_created
+        ON posts(subreddit, sentiment, created_utc DESC)
+    """)
+
     # Comments table for recursive comment analysis
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS comments (
@@ -281,6 +463,9 @@ def init_db():
         CREATE INDEX IF NOT EXISTS idx_comments_sentiment ON comments(sentiment)
     """)
 
+    # Refresh planner statistics so the new composite indexes get picked
+    cursor.execute("ANALYZE")
+
     conn.commit()
     conn.close()
 
@@ -288,7 +473,7 @@ def init_db():
 def cleanup_old_posts():
     """Remove posts older than KEEP_MONTHS"""
     cutoff = datetime.now() - timedelta(days=KEEP_MONTHS * 30)
-    conn = sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
+    conn = connect_write()
     cursor = conn.cursor()
 
     cursor.execute("DELETE FROM posts WHERE created_utc < ?", (cutoff,))
@@ -301,18 +486,21 @@ def cleanup_old_posts():
         print(f"Cleaned up {deleted} old posts")
 
 
-def fetch_reddit_posts(subreddit: str, limit: int = 25) -> List[dict]:
+async def fetch_reddit_posts(subreddit: str, limit: int = 25) -> List[dict]:
     """Fetch posts from Reddit JSON API"""
     url = f"https://www.reddit.com/r/{subreddit}.json"
     headers = {"User-Agent": "SentimentAnalysisBot/1.0 (Educational Purpose)"}
     params = {"limit": limit}
 
-    full_url = f"{url}?{urllib.parse.urlencode(params)}"
-    req = urllib.request.Request(full_url, headers=headers)
-
     try:
-        with urllib.request.urlopen(req, timeout=30) as response:
-            data = json.loads(response.read().decode("utf-8"))
+        session = get_http_session()
+        async with session.get(
+            url, params=params, headers=headers, timeout=aiohttp.ClientTimeout(total=30)
+        ) as response:
+            if response.status != 200:
+                print(f"Error fetching r/{subreddit}: HTTP {response.status}")
+                return []
+            data = await response.json()
     except Exception as e:
         print(f"Error fetching r/{subreddit}: {e}")
         return []
@@ -342,6 +530,9 @@ def fetch_reddit_posts(subreddit: str, limit: int = 25) -> List[dict]:
 
 async def analyze_sentiment(text: str) -> tuple:
     """Analyze sentiment using llama.cpp server"""
+    if time.monotonic() < _llm_fail_until:
+        return None, None
+
     prompt = f"""Analyze the sentiment of this Reddit post.
 Classify as: POSITIVE, NEGATIVE, or NEUTRAL.
 Score: -1.0 (negative) to +1.0 (positive).
@@ -357,14 +548,17 @@ Score: [number]"""
         "temperature": 0.1,
         "max_tokens": 30,
         "stop": ["\n\n", "Response:"],
+        # Reuse the KV cache for the static instruction prefix across calls
+        "cache_prompt": True,
     }
 
     try:
-        async with aiohttp.ClientSession() as session:
+        session = get_http_session()
+        async with _llm_semaphore:
             async with session.post(
                 f"{LLAMA_SERVER_URL}/completion",
                 json=payload,
-                timeout=aiohttp.ClientTimeout(total=30),
+                timeout=aiohttp.ClientTimeout(total=30, connect=2),
             ) as response:
                 if response.status != 200:
                     return None, None
@@ -384,7 +578,7 @@ Score: [number]"""
                     score = -0.7
 
                 # Extract numeric score
-                match = re.search(r"[-+]?\d*\.?\d+", completion)
+                match = _SCORE_RE.search(completion)
                 if match:
                     try:
                         s = float(match.group())
@@ -397,6 +591,7 @@ Score: [number]"""
 
     except Exception as e:
         print(f"Sentiment analysis error: {e}")
+        _trip_llm_breaker()
         return None, None
 
 
@@ -405,6 +600,9 @@ async def analyze_comment_sentiment(text: str) -> tuple:
     if not text or text.strip() == "[removed]":
         return None, None
 
+    if time.monotonic() < _llm_fail_until:
+        return None, None
+
     prompt = f"""Rate Reddit comment sentiment: POSITIVE, NEGATIVE, or NEUTRAL.
 Score: -1.0 to +1.0.
 
@@ -417,14 +615,16 @@ Respond: Sentiment: [P/N/NEU], Score: [number]"""
         "temperature": 0.1,
         "max_tokens": 20,
         "stop": ["\n\n"],
+        "cache_prompt": True,
     }
 
     try:
-        async with aiohttp.ClientSession() as session:
+        session = get_http_session()
+        async with _llm_semaphore:
             async with session.post(
                 f"{LLAMA_SERVER_URL}/completion",
                 json=payload,
-                timeout=aiohttp.ClientTimeout(total=15),
+                timeout=aiohttp.ClientTimeout(total=15, connect=2),
             ) as response:
                 if response.status != 200:
                     return None, None
@@ -445,7 +645,7 @@ Respond: Sentiment: [P/N/NEU], Score: [number]"""
                     sentiment = "neutral"
                     score = 0.0
 
-                match = re.search(r"[-+]?\d*\.?\d+", completion)
+                match = _SCORE_RE.search(completion)
                 if match:
                     try:
                         s = float(match.group())
@@ -458,12 +658,13 @@ Respond: Sentiment: [P/N/NEU], Score: [number]"""
 
     except Exception as e:
         print(f"Comment sentiment error: {e}")
+        _trip_llm_breaker()
         return None, None
 
 
 def store_comment(comment: dict, post_id: str, parent_id: Optional[str] = None, depth: int = 0):
     """Store a comment in the database"""
-    conn = sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
+    conn = connect_write()
     cursor = conn.cursor()
 
     try:
@@ -542,29 +743,49 @@ async def fetch_comments_for_post(
     url = f"https://www.reddit.com/r/{subreddit}/comments/{post_id}.json"
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers={"User-Agent": "reddit-sentiment-bot"}) as response:
-                if response.status != 200:
-                    print(f"Failed to fetch comments for {post_id}: {response.status}")
-                    return []
+        session = get_http_session()
+        async with session.get(url, headers={"User-Agent": "reddit-sentiment-bot"}) as response:
+            if response.status != 200:
+                print(f"Failed to fetch comments for {post_id}: {response.status}")
+                return []
 
-                data = await response.json()
+            data = await response.json()
 
-                # Comments are in the second element (first is the post)
-                comments_data = data[1].get("data", {}).get("children", []) if len(data) > 1 else []
+            # Comments are in the second element (first is the post)
+            comments_data = data[1].get("data", {}).get("children", []) if len(data) > 1 else []
 
-                all_comments = []
-                for comment_data in comments_data[:max_comments]:
-                    parsed = parse_comment_data(comment_data, post_id, depth=0)
-                    all_comments.extend(parsed)
+            all_comments = []
+            for comment_data in comments_data[:max_comments]:
+                parsed = parse_comment_data(comment_data, post_id, depth=0)
+                all_comments.extend(parsed)
 
-                return all_comments
+            return all_comments
 
     except Exception as e:
         print(f"Error fetching comments for {post_id}: {e}")
         return []
 
 
+_INSERT_COMMENT_SQL = """
+    INSERT OR IGNORE INTO comments
+    (id, post_id, parent_id, body, author, score, created_utc, permalink, depth,
+     sentiment, sentiment_score, analyzed_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def store_comments(rows: List[tuple], conn: Optional[sqlite3.Connection] = None):
+    """Bulk-insert comment rows with one executemany call"""
+    own_conn = conn is None
+    if own_conn:
+        conn = connect_write()
+    conn.cursor().executemany(_INSERT_COMMENT_SQL, rows)
+
+    if own_conn:
+        conn.commit()
+        conn.close()
+
+
 async def analyze_and_store_comments(post: dict, max_depth: int = 2, max_comments: int = 50) -> int:
     """Fetch, analyze, and store comments for a post"""
     comments = await fetch_comments_for_post(post, max_depth, max_comments)
@@ -572,54 +793,42 @@ async def analyze_and_store_comments(post: dict, max_depth: int = 2, max_comment
     if not comments:
         return 0
 
-    analyzed = 0
+    rows = []
     for comment in comments[:max_comments]:
-        # Analyze sentiment
         sentiment, score = await analyze_comment_sentiment(comment["body"])
-
-        # Store in database
-        conn = sqlite3.connect(
-            DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
+        rows.append(
+            (
+                comment["id"],
+                comment["post_id"],
+                comment.get("parent_id"),
+                comment["body"],
+                comment["author"],
+                comment["score"],
+                datetime.fromtimestamp(comment["created_utc"]),
+                comment["permalink"],
+                comment["depth"],
+                sentiment,
+                score,
+                datetime.now() if sentiment else None,
+            )
         )
-        cursor = conn.cursor()
 
-        try:
-            cursor.execute(
-                """
-                INSERT OR IGNORE INTO comments
-                (id, post_id, parent_id, body, author, score, created_utc, permalink, depth,
-                 sentiment, sentiment_score, analyzed_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    comment["id"],
-                    comment["post_id"],
-                    comment.get("parent_id"),
-                    comment["body"],
-                    comment["author"],
-                    comment["score"],
-                    datetime.fromtimestamp(comment["created_utc"]),
-                    comment["permalink"],
-                    comment["depth"],
-                    sentiment,
-                    score,
-                    datetime.now() if sentiment else None,
-                ),
-            )
-            conn.commit()
-            analyzed += 1
-        except Exception as e:
-            print(f"Error storing comment {comment['id']}: {e}")
-        finally:
-            conn.close()
+    # One write connection and transaction for the whole batch instead of a
+    # connect + commit per comment; the write runs on a worker thread so the
+    # event loop keeps serving requests while the fetcher stores comments
+    try:
+        await asyncio.to_thread(store_comments, rows)
+    except Exception as e:
+        print(f"Error storing comments for {post['id']}: {e}")
+        return 0
 
-    return analyzed
+    return len(rows)
 
 
 def get_comments_for_post(post_id: str, limit: int = 50) -> List[Comment]:
     """Get comments for a post from the database"""
-    conn = sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
-    cursor = conn.cursor()
+    cursor = get_read_conn().cursor()
+    cursor.row_factory = sqlite3.Row
 
     cursor.execute(
         """
@@ -633,33 +842,14 @@ def get_comments_for_post(post_id: str, limit: int = 50) -> List[Comment]:
         (post_id, limit),
     )
 
-    comments = []
-    for row in cursor.fetchall():
-        comments.append(
-            Comment(
-                id=row[0],
-                post_id=row[1],
-                parent_id=row[2],
-                body=row[3],
-                author=row[4],
-                score=row[5],
-                created_utc=row[6],
-                permalink=row[7],
-                depth=row[8],
-                sentiment=row[9],
-                sentiment_score=row[10],
-                analyzed_at=row[11],
-            )
-        )
-
-    conn.close()
-    return comments
+    # Rows come from our own DB: skip per-field Pydantic validation
+    return [Comment.model_construct(replies=[], **dict(row)) for row in cursor]
 
 
 def get_comments_tree(post_id: str, max_depth: int = 3, max_per_level: int = 20) -> List[Comment]:
     """Get comments organized as a tree structure"""
-    conn = sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
-    cursor = conn.cursor()
+    cursor = get_read_conn().cursor()
+    cursor.row_factory = sqlite3.Row
 
     cursor.execute(
         """
@@ -675,21 +865,8 @@ def get_comments_tree(post_id: str, max_depth: int = 3, max_per_level: int = 20)
     all_comments = {}
     root_comments = []
 
-    for row in cursor.fetchall():
-        comment = Comment(
-            id=row[0],
-            post_id=row[1],
-            parent_id=row[2],
-            body=row[3],
-            author=row[4],
-            score=row[5],
-            created_utc=row[6],
-            permalink=row[7],
-            depth=row[8],
-            sentiment=row[9],
-            sentiment_score=row[10],
-            analyzed_at=row[11],
-        )
+    for row in cursor:
+        comment = Comment.model_construct(replies=[], **dict(row))
         all_comments[comment.id] = comment
 
     # Build tree
@@ -711,14 +888,12 @@ def get_comments_tree(post_id: str, max_depth: int = 3, max_per_level: int = 20)
     # Limit root comments
     root_comments = root_comments[:max_per_level]
 
-    conn.close()
     return root_comments
 
 
 def get_comment_stats(post_id: str) -> dict:
     """Get comment sentiment statistics for a post"""
-    conn = sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
-    cursor = conn.cursor()
+    cursor = get_read_conn().cursor()
 
     cursor.execute(
         """
@@ -735,7 +910,6 @@ def get_comment_stats(post_id: str) -> dict:
     )
 
     row = cursor.fetchone()
-    conn.close()
 
     total = row[0] or 0
     positive = row[1] or 0
@@ -754,100 +928,185 @@ def get_comment_stats(post_id: str) -> dict:
     }
 
 
-def store_post(post: dict, sentiment: Optional[str] = None, score: Optional[float] = None):
-    """Store post in database"""
-    conn = sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
-    cursor = conn.cursor()
+# Kept verbatim at module level: SQLite's prepared-statement cache is keyed
+# by the literal SQL string
+_INSERT_POST_SQL = """
+    INSERT OR REPLACE INTO posts
+    (id, title, selftext, selftext_snippet, author, score, ups, downs, num_comments,
+     created_utc, permalink, url, subreddit, sentiment, sentiment_score, analyzed_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
 
-    cursor.execute(
-        """
-        INSERT OR REPLACE INTO posts 
-        (id, title, selftext, author, score, ups, downs, num_comments, 
-         created_utc, permalink, url, subreddit, sentiment, sentiment_score, analyzed_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """,
-        (
-            post["id"],
-            post["title"],
-            post["selftext"],
-            post["author"],
-            post["score"],
-            post["ups"],
-            post["downs"],
-            post["num_comments"],
-            post["created_utc"],
-            post["permalink"],
-            post["url"],
-            post["subreddit"],
-            sentiment or None,
-            score,
-            datetime.now(),
-        ),
+
+def _post_row(
+    post: dict, sentiment: Optional[str] = None, score: Optional[float] = None
+) -> tuple:
+    """Build the parameter tuple for _INSERT_POST_SQL"""
+    return (
+        post["id"],
+        post["title"],
+        post["selftext"],
+        post["selftext"][:SNIPPET_LENGTH],
+        post["author"],
+        post["score"],
+        post["ups"],
+        post["downs"],
+        post["num_comments"],
+        post["created_utc"],
+        post["permalink"],
+        post["url"],
+        post["subreddit"],
+        sentiment or None,
+        score,
+        datetime.now(),
     )
 
-    conn.commit()
-    conn.close()
+
+def store_post(
+    post: dict,
+    sentiment: Optional[str] = None,
+    score: Optional[float] = None,
+    conn: Optional[sqlite3.Connection] = None,
+):
+    """Store post in database. Uses the given connection if provided (caller commits)."""
+    store_posts([_post_row(post, sentiment, score)], conn=conn)
+
+
+def store_posts(rows: List[tuple], conn: Optional[sqlite3.Connection] = None):
+    """Bulk-insert post rows with one executemany call"""
+    own_conn = conn is None
+    if own_conn:
+        conn = connect_write()
+    conn.cursor().executemany(_INSERT_POST_SQL, rows)
+
+    if own_conn:
+        conn.commit()
+        conn.close()
 
 
 async def fetch_and_analyze_subreddit(subreddit: str) -> int:
     """Fetch posts from a subreddit and analyze sentiment"""
     print(f"Fetching r/{subreddit}...")
-    posts = fetch_reddit_posts(subreddit, MAX_POSTS_PER_FETCH)
+    posts = await fetch_reddit_posts(subreddit, MAX_POSTS_PER_FETCH)
 
     analyzed = 0
     comments_analyzed = 0
 
-    for post in posts:
-        # Skip if already exists
-        conn = sqlite3.connect(
-            DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
-        )
-        cursor = conn.cursor()
-        cursor.execute("SELECT id FROM posts WHERE id = ?", (post["id"],))
-        if cursor.fetchone():
-            conn.close()
-            continue
-        conn.close()
-
-        # Analyze sentiment
-        text = f"{post['title']} {post['selftext'][:200]}"
-        sentiment, score = await analyze_sentiment(text)
+    # One connection for the whole subreddit cycle instead of one per post
+    conn = connect_write()
+    cursor = conn.cursor()
 
-        store_post(post, sentiment, score)
-        analyzed += 1
+    try:
+        # One bulk lookup for the whole batch instead of a SELECT per post
+        existing = set()
+        if posts:
+            ids = [post["id"] for post in posts]
+            placeholders = ",".join("?" * len(ids))
+            cursor.execute(f"SELECT id FROM posts WHERE id IN ({placeholders})", ids)
+            existing = {row[0] for row in cursor.fetchall()}
+        new_posts = [post for post in posts if post["id"] not in existing]
+
+        # Analyze all new posts concurrently; _llm_semaphore caps in-flight requests
+        # and llama.cpp's continuous batching coalesces them server-side
+        texts = [f"{post['title']} {post['selftext'][:200]}" for post in new_posts]
+        results = await asyncio.gather(*[analyze_sentiment(text) for text in texts])
+
+        # Store the whole batch in one executemany + transaction
+        rows = [
+            _post_row(post, sentiment, score)
+            for post, (sentiment, score) in zip(new_posts, results, strict=True)
+        ]
+        store_posts(rows, conn=conn)
+        analyzed = len(rows)
+        conn.commit()
+    finally:
+        conn.close()
 
-        # Fetch and analyze comments for this post
+    # Fetch and analyze comments after the posts transaction is committed
+    for post in new_posts:
         try:
             post_comments = await analyze_and_store_comments(post, max_depth=2, max_comments=25)
             comments_analyzed += post_comments
         except Exception as e:
             print(f"  Error fetching comments for {post['id']}: {e}")
 
-        # Rate limit
-        await asyncio.sleep(0.5)
-
     print(f"  Analyzed {analyzed} new posts from r/{subreddit}")
     if comments_analyzed > 0:
         print(f"  Analyzed {comments_analyzed} comments")
     return analyzed
 
 
+async def rescore_unanalyzed_posts(limit: int = 100) -> int:
+    """Retry sentiment analysis for posts stored while the LLM was unreachable"""
+    if time.monotonic() < _llm_fail_until:
+        return 0
+
+    conn = connect_write()
+    cursor = conn.cursor()
+
+    cursor.execute(
+        """
+        SELECT id, title, selftext FROM posts
+        WHERE sentiment IS NULL
+        ORDER BY created_utc DESC LIMIT ?
+    """,
+        (limit,),
+    )
+    rows = cursor.fetchall()
+
+    if not rows:
+        conn.close()
+        return 0
+
+    texts = [f"{title} {(selftext or '')[:200]}" for _, title, selftext in rows]
+    results = await asyncio.gather(*[analyze_sentiment(text) for text in texts])
+
+    updated = 0
+    now = datetime.now()
+    for (post_id, _, _), (sentiment, score) in zip(rows, results, strict=True):
+        if sentiment is None:
+            continue
+        cursor.execute(
+            "UPDATE posts SET sentiment = ?, sentiment_score = ?, analyzed_at = ? WHERE id = ?",
+            (sentiment, score, now, post_id),
+        )
+        updated += 1
+
+    conn.commit()
+    conn.close()
+    return updated
+
+
 # Background fetcher
 async def background_fetcher():
     """Continuously fetch posts from all AI subreddits"""
-    while True:
-        total_analyzed = 0
-        for subreddit in AI_SUBREDDITS:
+    async def fetch_one(subreddit: str) -> int:
+        async with _reddit_semaphore:
             try:
-                analyzed = await fetch_and_analyze_subreddit(subreddit)
-                total_analyzed += analyzed
+                return await fetch_and_analyze_subreddit(subreddit)
             except Exception as e:
                 print(f"Error fetching r/{subreddit}: {e}")
+                return 0
 
-        # Cleanup old posts
-        cleanup_old_posts()
+    while True:
+        # All subreddits in parallel, capped by _reddit_semaphore
+        results = await asyncio.gather(*[fetch_one(subreddit) for subreddit in AI_SUBREDDITS])
+        total_analyzed = sum(results)
+
+        # Retry posts stored without sentiment during an LLM outage
+        try:
+            rescored = await rescore_unanalyzed_posts()
+            if rescored > 0:
+                print(f"Rescored {rescored} previously unanalyzed posts")
+        except Exception as e:
+            print(f"Error rescoring unanalyzed posts: {e}")
+
+        # Cleanup old posts (worker thread: the DELETE can touch many rows)
+        await asyncio.to_thread(cleanup_old_posts)
 
         if total_analyzed > 0:
+            invalidate_stats_cache()
+            invalidate_sentiment_cache()
             print(f"Background fetch complete: {total_analyzed} new posts")
 
         # Wait 15 minutes
@@ -862,6 +1121,9 @@ async def lifespan(app: FastAPI):
     print(f"Database initialized. Collecting from {len(AI_SUBREDDITS)} subreddits")
     print(f"Subreddits: {', '.join(AI_SUBREDDITS)}")
 
+    # Shared HTTP session for llama.cpp and Reddit calls
+    app.state.http = get_http_session()
+
     # Start background fetcher
     fetcher_task = asyncio.create_task(background_fetcher())
 
@@ -874,8 +1136,20 @@ async def lifespan(app: FastAPI):
     except asyncio.CancelledError:
         pass
 
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+
+    # Refresh query planner statistics before exit
+    conn = sqlite3.connect(DB_PATH)
+    conn.execute("PRAGMA optimize")
+    conn.close()
+
 
-app = FastAPI(title="Reddit Sentiment Analysis API", lifespan=lifespan)
+app = FastAPI(
+    title="Reddit Sentiment Analysis API",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 # Mount static files AFTER app creation
 app.mount("/js", StaticFiles(directory=str(JS_DIR)), name="js")
@@ -898,9 +1172,22 @@ async def get_subreddits():
 
 @app.get("/api/stats")
 async def get_stats():
-    """Get overall statistics"""
-    conn = sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
-    cursor = conn.cursor()
+    """Get overall statistics (cached for STATS_CACHE_TTL_SECONDS)"""
+    global _stats_cache, _stats_cached_at
+
+    async with _stats_lock:
+        if _stats_cache is not None and time.monotonic() - _stats_cached_at < STATS_CACHE_TTL_SECONDS:
+            return _stats_cache
+
+        stats = await asyncio.to_thread(compute_stats)
+        _stats_cache = stats
+        _stats_cached_at = time.monotonic()
+        return stats
+
+
+def compute_stats() -> dict:
+    """Run the /api/stats aggregation queries"""
+    cursor = get_read_conn().cursor()
 
     # Total posts
     cursor.execute("SELECT COUNT(*) FROM posts")
@@ -924,8 +1211,6 @@ async def get_stats():
     cursor.execute("SELECT MAX(fetched_at) FROM posts")
     last_updated = cursor.fetchone()[0]
 
-    conn.close()
-
     return {
         "total_posts": total,
         "sentiment": {
@@ -945,77 +1230,63 @@ async def search_posts(
     subreddits: Optional[str] = Query(None, description="Comma-separated subreddits"),
     limit: int = Query(50, description="Max results"),
     sentiment: Optional[str] = Query(None, description="Filter by sentiment"),
+    sort: str = Query("top", description="Order: 'top' (score) or 'relevance' (bm25)"),
 ):
     """Search posts using FTS5 full-text search"""
-    conn = sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
-    cursor = conn.cursor()
-
-    # FTS query to get matching rowids
-    fts_query = "SELECT rowid FROM posts_fts WHERE posts_fts MATCH ?"
-    cursor.execute(fts_query, [q])
-    rowids = [r[0] for r in cursor.fetchall()]
-
-    posts = []
-    positive = neutral = negative = 0
-
-    if rowids:
-        # Fetch full posts from main table
-        placeholders = ",".join("?" * len(rowids))
-        cursor.execute(
-            f"""
-            SELECT id, title, selftext, author, score, ups, downs, num_comments,
-                   created_utc, permalink, url, subreddit, sentiment, sentiment_score, analyzed_at
-            FROM posts WHERE rowid IN ({placeholders})
-        """,
-            rowids,
-        )
-
-        all_posts = []
-        for row in cursor.fetchall():
-            post = Post(
-                id=row[0],
-                title=row[1],
-                selftext=row[2],
-                author=row[3],
-                score=row[4],
-                ups=row[5],
-                downs=row[6],
-                num_comments=row[7],
-                created_utc=row[8],
-                permalink=row[9],
-                url=row[10],
-                subreddit=row[11],
-                sentiment=row[12],
-                sentiment_score=row[13],
-                analyzed_at=row[14],
-            )
-            all_posts.append(post)
+    return await asyncio.to_thread(query_search, q, subreddits, limit, sentiment, sort)
+
+
+def query_search(
+    q: str, subreddits: Optional[str], limit: int, sentiment: Optional[str], sort: str = "top"
+) -> SearchResult:
+    """Synchronous body of /api/search (runs on a worker thread)"""
+    cursor = get_read_conn().cursor()
+    cursor.row_factory = sqlite3.Row
+
+    # One query: FTS match joined to posts, with filtering, ordering, and
+    # limit done in SQL instead of hydrating every match into Python
+    sql = """
+        SELECT p.id, p.title, p.selftext_snippet AS selftext, p.author, p.score, p.ups, p.downs,
+               p.num_comments, p.created_utc, p.permalink, p.url, p.subreddit,
+               p.sentiment, p.sentiment_score, p.analyzed_at
+        FROM posts_fts f
+        JOIN posts p ON p.rowid = f.rowid
+        WHERE posts_fts MATCH ?
+    """
+    params: list[Any] = [q]
 
-        # Filter by subreddits if specified
-        if subreddits:
-            sub_list = [s.strip() for s in subreddits.split(",")]
-            all_posts = [p for p in all_posts if p.subreddit in sub_list]
+    if subreddits:
+        sub_list = [s.strip() for s in subreddits.split(",")]
+        sub_placeholders = ",".join("?" * len(sub_list))
+        sql += f" AND p.subreddit IN ({sub_placeholders})"
+        params.extend(sub_list)
 
-        # Filter by sentiment if specified
-        if sentiment:
-            all_posts = [p for p in all_posts if p.sentiment == sentiment]
+    if sentiment:
+        sql += " AND p.sentiment = ?"
+        params.append(sentiment)
 
-        # Sort by score and limit
-        all_posts.sort(key=lambda x: x.score or 0, reverse=True)
-        all_posts = all_posts[:limit]
+    if sort == "relevance":
+        # bm25() returns lower-is-better relevance scores
+        sql += " ORDER BY bm25(posts_fts) LIMIT ?"
+    else:
+        sql += " ORDER BY p.score DESC LIMIT ?"
+    params.append(limit)
 
-        # Count sentiments
-        for post in all_posts:
-            if post.sentiment == "positive":
-                positive += 1
-            elif post.sentiment == "negative":
-                negative += 1
-            else:
-                neutral += 1
+    cursor.execute(sql, params)
 
-        posts = all_posts
+    posts = []
+    positive = neutral = negative = 0
 
-    conn.close()
+    # Rows come from our own DB: skip per-field Pydantic validation
+    for row in cursor:
+        post = Post.model_construct(**dict(row))
+        if post.sentiment == "positive":
+            positive += 1
+        elif post.sentiment == "negative":
+            negative += 1
+        else:
+            neutral += 1
+        posts.append(post)
 
     return SearchResult(
         query=q,
@@ -1027,95 +1298,126 @@ async def search_posts(
     )
 
 
-@app.get("/api/search/analysis", response_model=SearchAnalysis)
-async def search_analysis(
-    q: str = Query(..., description="Search query"),
-    subreddits: Optional[str] = Query(None, description="Comma-separated subreddits"),
-    limit: int = Query(30, description="Max posts to analyze"),
-):
-    """Get detailed analysis of posts about a topic with AI summary"""
-    conn = sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
-    cursor = conn.cursor()
+@dataclass
+class TopicAnalysis:
+    """Result of the shared FTS lookup + sentiment categorization pipeline"""
+
+    query: str
+    total: int
+    positive_count: int
+    negative_count: int
+    neutral_count: int
+    positive_percent: float
+    negative_percent: float
+    overall_tone: str
+    positive_examples: List[dict]
+    negative_examples: List[dict]
+    neutral_examples: List[dict]
+    snippets: List[str]
+
+    def sentiment_summary_dict(self) -> dict:
+        return {
+            "positive": self.positive_count,
+            "neutral": self.neutral_count,
+            "negative": self.negative_count,
+            "total": self.total,
+            "positive_percent": round(self.positive_percent, 1),
+            "negative_percent": round(self.negative_percent, 1),
+            "overall_tone": self.overall_tone,
+        }
 
-    # FTS query
-    fts_query = "SELECT rowid FROM posts_fts WHERE posts_fts MATCH ?"
-    cursor.execute(fts_query, [q])
-    rowids = [r[0] for r in cursor.fetchall()]
 
-    if not rowids:
-        conn.close()
-        return SearchAnalysis(
-            query=q,
-            summary=f"No posts found about '{q}'",
-            sentiment_summary=SentimentSummary(
-                positive=0,
-                neutral=0,
-                negative=0,
-                total=0,
-                positive_percent=0,
-                negative_percent=0,
-                overall_tone="Unknown",
-            ),
-            positive_examples=[],
-            negative_examples=[],
-            neutral_examples=[],
-        )
+def _make_citation(row: sqlite3.Row) -> dict:
+    """Build a citation dict from a raw posts row"""
+    title = row["title"]
+    return {
+        "title": title[:100] + "..." if len(title) > 100 else title,
+        "subreddit": row["subreddit"],
+        "author": row["author"],
+        "sentiment": row["sentiment"] or "unknown",
+        "score": row["score"] or 0,
+        "url": row["permalink"],
+    }
 
-    # Fetch posts
-    placeholders = ",".join("?" * len(rowids))
-    cursor.execute(
-        f"""
-        SELECT id, title, selftext, author, score, ups, downs, num_comments,
-               created_utc, permalink, url, subreddit, sentiment, sentiment_score, analyzed_at
-        FROM posts WHERE rowid IN ({placeholders})
-    """,
-        rowids,
-    )
 
-    all_posts = []
-    for row in cursor.fetchall():
-        post = Post(
-            id=row[0],
-            title=row[1],
-            selftext=row[2],
-            author=row[3],
-            score=row[4],
-            ups=row[5],
-            downs=row[6],
-            num_comments=row[7],
-            created_utc=row[8],
-            permalink=row[9],
-            url=row[10],
-            subreddit=row[11],
-            sentiment=row[12],
-            sentiment_score=row[13],
-            analyzed_at=row[14],
-        )
-        all_posts.append(post)
+def analyze_topic(q: str, subreddits: Optional[str], limit: int) -> TopicAnalysis:
+    """FTS lookup, sentiment categorization, and example selection for a topic.
+
+    Shared by /api/search/analysis and its streaming variant. Works on raw
+    sqlite rows; only the emitted example citations become dicts.
+    """
+    cursor = get_read_conn().cursor()
+    cursor.row_factory = sqlite3.Row
 
-    # Filter by subreddits if specified
+    # One query: the FTS match joins straight to posts, so there's no
+    # intermediate rowid list (and no 999-parameter IN-clause limit), and
+    # filtering, engagement sort, and limit all run in SQL. Only the columns
+    # the citations and summary snippets actually read are selected. The
+    # window ranks each matched row within its sentiment bucket by score so
+    # the top-3 example citations fall out of the same result set.
+    sub_filter = ""
+    params: list[Any] = [q]
     if subreddits:
         sub_list = [s.strip() for s in subreddits.split(",")]
-        all_posts = [p for p in all_posts if p.subreddit in sub_list]
+        sub_placeholders = ",".join("?" * len(sub_list))
+        sub_filter = f" AND p.subreddit IN ({sub_placeholders})"
+        params.extend(sub_list)
+    params.append(limit)
 
-    conn.close()
+    cursor.execute(
+        f"""
+        WITH matches AS (
+            SELECT p.title, p.selftext_snippet AS selftext, p.author, p.score,
+                   p.permalink, p.subreddit, p.sentiment, p.num_comments
+            FROM posts_fts f
+            JOIN posts p ON p.rowid = f.rowid
+            WHERE posts_fts MATCH ?{sub_filter}
+            ORDER BY (COALESCE(p.score, 0) + COALESCE(p.num_comments, 0)) DESC
+            LIMIT ?
+        )
+        SELECT *,
+               ROW_NUMBER() OVER (
+                   PARTITION BY CASE WHEN sentiment IN ('positive', 'negative')
+                                     THEN sentiment ELSE 'neutral' END
+                   ORDER BY score DESC
+               ) AS rn,
+               COUNT(*) FILTER (WHERE sentiment = 'positive') OVER () AS positive_total,
+               COUNT(*) FILTER (WHERE sentiment = 'negative') OVER () AS negative_total
+        FROM matches
+        ORDER BY (COALESCE(score, 0) + COALESCE(num_comments, 0)) DESC
+    """,
+        params,
+    )
+    rows = cursor.fetchall()
 
-    # Sort by engagement
-    all_posts.sort(key=lambda x: (x.score or 0) + (x.num_comments or 0), reverse=True)
-    all_posts = all_posts[:limit]
+    if not rows:
+        return TopicAnalysis(
+            query=q,
+            total=0,
+            positive_count=0,
+            negative_count=0,
+            neutral_count=0,
+            positive_percent=0,
+            negative_percent=0,
+            overall_tone="Unknown",
+            positive_examples=[],
+            negative_examples=[],
+            neutral_examples=[],
+            snippets=[],
+        )
 
-    # Categorize by sentiment
-    positive_posts = [p for p in all_posts if p.sentiment == "positive"]
-    negative_posts = [p for p in all_posts if p.sentiment == "negative"]
-    neutral_posts = [
-        p for p in all_posts if p.sentiment != "positive" and p.sentiment != "negative"
-    ]
+    # The window aggregates already counted each bucket across the matched
+    # set, so Python only collects the pre-ranked example citations
+    examples = {"positive": [], "negative": [], "neutral": []}
+    for r in rows:
+        if r["rn"] <= 3:
+            bucket = r["sentiment"] if r["sentiment"] in ("positive", "negative") else "neutral"
+            examples[bucket].append(_make_citation(r))
 
-    # Count sentiments
-    positive_count = len(positive_posts)
-    negative_count = len(negative_posts)
-    neutral_count = len(neutral_posts)
-    total = len(all_posts)
+    total = len(rows)
+    positive_count = rows[0]["positive_total"]
+    negative_count = rows[0]["negative_total"]
+    neutral_count = total - positive_count - negative_count
 
     positive_percent = (positive_count / total * 100) if total > 0 else 0
     negative_percent = (negative_count / total * 100) if total > 0 else 0
@@ -1134,41 +1436,78 @@ async def search_analysis(
     else:
         overall_tone = "Neutral/Mixed"
 
-    # Create citations
-    def make_citation(post: Post) -> Citation:
-        return Citation(
-            title=post.title[:100] + "..." if len(post.title) > 100 else post.title,
-            subreddit=post.subreddit,
-            author=post.author,
-            sentiment=post.sentiment or "unknown",
-            score=post.score or 0,
-            url=post.permalink,
-        )
+    # Content snippets for the summary prompt
+    snippets = [
+        f"Title: {r['title']}\nContent: {r['selftext'][:200] if r['selftext'] else 'N/A'}"
+        for r in rows[:10]
+    ]
+
+    return TopicAnalysis(
+        query=q,
+        total=total,
+        positive_count=positive_count,
+        negative_count=negative_count,
+        neutral_count=neutral_count,
+        positive_percent=positive_percent,
+        negative_percent=negative_percent,
+        overall_tone=overall_tone,
+        positive_examples=examples["positive"],
+        negative_examples=examples["negative"],
+        neutral_examples=examples["neutral"],
+        snippets=snippets,
+    )
+
+
+def build_summary_prompt(analysis: TopicAnalysis) -> str:
+    """Build the llama.cpp prompt for the topic summary.
 
-    positive_examples = [make_citation(p) for p in positive_posts[:3]]
-    negative_examples = [make_citation(p) for p in negative_posts[:3]]
-    neutral_examples = [make_citation(p) for p in neutral_posts[:3]]
+    The fixed instructions lead and the per-query content trails, so with
+    cache_prompt the server reuses the prefix's KV cache across queries and
+    only prefills the changed suffix.
+    """
+    content_text = "\n---\n".join(analysis.snippets)
+
+    return f"""Analyze the Reddit discussions below and write a 2-3 sentence summary of what people are discussing and their general sentiment. Be concise and factual.
+
+Topic: "{analysis.query}"
+
+Stats: {analysis.positive_count} positive, {analysis.negative_count} negative, {analysis.neutral_count} neutral posts. Overall tone: {analysis.overall_tone}.
+
+Recent posts:
+{content_text}"""
 
-    # Generate AI summary
-    summary_text = await generate_topic_summary(
-        q, all_posts, positive_count, negative_count, neutral_count, overall_tone
+
+def fallback_summary(analysis: TopicAnalysis) -> str:
+    """Static summary used when the LLM is unavailable"""
+    return (
+        f"Found {analysis.total} discussions about '{analysis.query}'. "
+        f"The community sentiment is {analysis.overall_tone.lower()} with "
+        f"{analysis.positive_count} positive, {analysis.negative_count} negative, "
+        f"and {analysis.neutral_count} neutral reactions."
     )
 
+
+@app.get("/api/search/analysis", response_model=SearchAnalysis)
+async def search_analysis(
+    q: str = Query(..., description="Search query"),
+    subreddits: Optional[str] = Query(None, description="Comma-separated subreddits"),
+    limit: int = Query(30, description="Max posts to analyze"),
+):
+    """Get detailed analysis of posts about a topic with AI summary"""
+    analysis = await asyncio.to_thread(analyze_topic, q, subreddits, limit)
+
+    if analysis.total == 0:
+        summary_text = f"No posts found about '{q}'"
+    else:
+        summary_text = await generate_topic_summary(analysis)
+
     return SearchAnalysis(
         query=q,
         summary=summary_text,
-        sentiment_summary=SentimentSummary(
-            positive=positive_count,
-            neutral=neutral_count,
-            negative=negative_count,
-            total=total,
-            positive_percent=round(positive_percent, 1),
-            negative_percent=round(negative_percent, 1),
-            overall_tone=overall_tone,
-        ),
-        positive_examples=positive_examples,
-        negative_examples=negative_examples,
-        neutral_examples=neutral_examples,
+        sentiment_summary=SentimentSummary(**analysis.sentiment_summary_dict()),
+        positive_examples=[Citation(**c) for c in analysis.positive_examples],
+        negative_examples=[Citation(**c) for c in analysis.negative_examples],
+        neutral_examples=[Citation(**c) for c in analysis.neutral_examples],
     )
 
 
@@ -1180,164 +1519,56 @@ async def search_analysis_stream(
 ):
     """Stream detailed analysis of posts about a topic with real-time progress"""
 
-    async def event_generator():
-        conn = sqlite3.connect(
-            DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
-        )
-        cursor = conn.cursor()
-
-        yield f"event: status\ndata: {json.dumps({'message': f'Searching for posts about "{q}"...'})}\n\n"
-
-        # FTS query
-        fts_query = "SELECT rowid FROM posts_fts WHERE posts_fts MATCH ?"
-        cursor.execute(fts_query, [q])
-        rowids = [r[0] for r in cursor.fetchall()]
-
-        if not rowids:
-            conn.close()
-            yield f"event: complete\ndata: {
-                json.dumps(
-                    {
-                        'query': q,
-                        'summary': f"No posts found about '{q}'",
-                        'sentiment_summary': {
-                            'positive': 0,
-                            'neutral': 0,
-                            'negative': 0,
-                            'total': 0,
-                            'positive_percent': 0,
-                            'negative_percent': 0,
-                            'overall_tone': 'Unknown',
-                        },
-                        'positive_examples': [],
-                        'negative_examples': [],
-                        'neutral_examples': [],
-                    }
-                )
-            }\n\n"
-            return
+    def sse(event: str, payload: dict) -> bytes:
+        return sse_raw(event, orjson.dumps(payload))
 
-        yield f"event: status\ndata: {json.dumps({'message': f'Found {len(rowids)} posts, fetching details...'})}\n\n"
+    def sse_raw(event: str, data: bytes) -> bytes:
+        # Frames stay bytes all the way: orjson output is spliced between the
+        # prebuilt header/trailer and StreamingResponse passes bytes straight
+        # through to the ASGI server with no re-encode
+        return b"event: " + event.encode() + b"\ndata: " + data + b"\n\n"
 
-        # Fetch posts
-        placeholders = ",".join("?" * len(rowids))
-        cursor.execute(
-            f"""
-            SELECT id, title, selftext, author, score, ups, downs, num_comments,
-                   created_utc, permalink, url, subreddit, sentiment, sentiment_score, analyzed_at
-            FROM posts WHERE rowid IN ({placeholders})
-        """,
-            rowids,
-        )
+    async def event_generator():
+        yield sse("status", {"message": f'Searching for posts about "{q}"...'})
+
+        analysis = await asyncio.to_thread(analyze_topic, q, subreddits, limit)
 
-        all_posts = []
-        for row in cursor.fetchall():
-            post = Post(
-                id=row[0],
-                title=row[1],
-                selftext=row[2],
-                author=row[3],
-                score=row[4],
-                ups=row[5],
-                downs=row[6],
-                num_comments=row[7],
-                created_utc=row[8],
-                permalink=row[9],
-                url=row[10],
-                subreddit=row[11],
-                sentiment=row[12],
-                sentiment_score=row[13],
-                analyzed_at=row[14],
+        if analysis.total == 0:
+            yield sse(
+                "complete",
+                {
+                    "query": q,
+                    "summary": f"No posts found about '{q}'",
+                    "sentiment_summary": analysis.sentiment_summary_dict(),
+                    "positive_examples": [],
+                    "negative_examples": [],
+                    "neutral_examples": [],
+                },
             )
-            all_posts.append(post)
+            return
 
-        conn.close()
+        yield sse("status", {"message": f"Found {analysis.total} posts, analyzing..."})
 
-        # Filter by subreddits if specified
-        if subreddits:
-            sub_list = [s.strip() for s in subreddits.split(",")]
-            all_posts = [p for p in all_posts if p.subreddit in sub_list]
-
-        # Sort by engagement
-        all_posts.sort(key=lambda x: (x.score or 0) + (x.num_comments or 0), reverse=True)
-        all_posts = all_posts[:limit]
-
-        # Categorize by sentiment
-        positive_posts = [p for p in all_posts if p.sentiment == "positive"]
-        negative_posts = [p for p in all_posts if p.sentiment == "negative"]
-        neutral_posts = [p for p in all_posts if p.sentiment not in ["positive", "negative"]]
-
-        positive_count = len(positive_posts)
-        negative_count = len(negative_posts)
-        neutral_count = len(neutral_posts)
-        total = len(all_posts)
-
-        positive_percent = (positive_count / total * 100) if total > 0 else 0
-        negative_percent = (negative_count / total * 100) if total > 0 else 0
-
-        if positive_percent > 60:
-            overall_tone = "Mostly Positive"
-        elif negative_percent > 60:
-            overall_tone = "Mostly Negative"
-        elif positive_percent > 40 and negative_percent > 40:
-            overall_tone = "Mixed (Polarized)"
-        elif positive_percent > 30 and negative_percent < 20:
-            overall_tone = "Slightly Positive"
-        elif negative_percent > 30 and positive_percent < 20:
-            overall_tone = "Slightly Negative"
-        else:
-            overall_tone = "Neutral/Mixed"
-
-        # Create citations
-        def make_citation(post: Post) -> dict:
-            return {
-                "title": post.title[:100] + "..." if len(post.title) > 100 else post.title,
-                "subreddit": post.subreddit,
-                "author": post.author,
-                "sentiment": post.sentiment or "unknown",
-                "score": post.score or 0,
-                "url": post.permalink,
+        # Serialize the stable fragments once: the sentiment event and the
+        # final complete frame splice in the same pre-encoded bytes instead
+        # of re-serializing the stats and example lists per frame
+        stats_bytes = orjson.dumps(analysis.sentiment_summary_dict())
+        examples_bytes = orjson.dumps(
+            {
+                "positive_examples": analysis.positive_examples,
+                "negative_examples": analysis.negative_examples,
+                "neutral_examples": analysis.neutral_examples,
             }
-
-        positive_examples = [make_citation(p) for p in positive_posts[:3]]
-        negative_examples = [make_citation(p) for p in negative_posts[:3]]
-        neutral_examples = [make_citation(p) for p in neutral_posts[:3]]
+        )
 
         # Send sentiment stats immediately
-        yield f"event: sentiment\ndata: {
-            json.dumps(
-                {
-                    'positive': positive_count,
-                    'neutral': neutral_count,
-                    'negative': negative_count,
-                    'total': total,
-                    'positive_percent': round(positive_percent, 1),
-                    'negative_percent': round(negative_percent, 1),
-                    'overall_tone': overall_tone,
-                }
-            )
-        }\n\n"
+        yield sse_raw("sentiment", stats_bytes)
 
         # Generate AI summary with streaming
-        yield f"event: status\ndata: {json.dumps({'message': 'Generating AI summary...'})}\n\n"
-
-        # Get content snippets
-        snippets = []
-        for post in all_posts[:10]:
-            content = (
-                f"Title: {post.title}\nContent: {post.selftext[:200] if post.selftext else 'N/A'}"
-            )
-            snippets.append(content)
-        content_text = "\n---\n".join(snippets)
-
-        prompt = f"""Analyze Reddit discussions about "{q}".
-
-Stats: {positive_count} positive, {negative_count} negative, {neutral_count} neutral posts. Overall tone: {overall_tone}.
+        yield sse("status", {"message": "Generating AI summary..."})
 
-Recent posts:
-{content_text}
-
-Write a 2-3 sentence summary of what people are discussing and their general sentiment. Be concise and factual."""
+        prompt = build_summary_prompt(analysis)
+        accumulated = ""
 
         try:
             payload = {
@@ -1346,86 +1577,63 @@ Write a 2-3 sentence summary of what people are discussing and their general sen
                 "max_tokens": 150,
                 "stop": ["<|im_end|>"],
                 "stream": True,
+                "cache_prompt": True,
             }
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{LLAMA_SERVER_URL}/completion",
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=30),
-                ) as response:
-                    if response.status == 200:
-                        accumulated = ""
-                        async for line in response.content:
-                            line = line.decode("utf-8").strip()
-                            if line.startswith("data: "):
-                                try:
-                                    data = json.loads(line[6:])
-                                    if "content" in data:
-                                        chunk = data["content"]
-                                        accumulated += chunk
-                                        yield f"event: summary_chunk\ndata: {json.dumps({'chunk': chunk, 'accumulated': accumulated})}\n\n"
-                                except json.JSONDecodeError:
-                                    pass
+            session = get_http_session()
+            async with _summary_semaphore, session.post(
+                f"{LLAMA_SERVER_URL}/completion",
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=30),
+            ) as response:
+                if response.status == 200:
+                    # Scan the byte stream for "data: " frames directly; no
+                    # per-line decode/strip/slice on the str level
+                    buffer = b""
+                    async for raw, _ in response.content.iter_chunks():
+                        buffer += raw
+                        while (newline := buffer.find(b"\n")) >= 0:
+                            line = buffer[:newline]
+                            buffer = buffer[newline + 1 :]
+                            if not line.startswith(b"data: "):
+                                continue
+                            try:
+                                data = orjson.loads(line[6:])
+                            except orjson.JSONDecodeError:
+                                continue
+                            if "content" in data:
+                                chunk = data["content"]
+                                accumulated += chunk
+                                yield sse(
+                                    "summary_chunk",
+                                    {"chunk": chunk, "accumulated": accumulated},
+                                )
         except Exception as e:
             print(f"Error streaming summary: {e}")
-            accumulated = f"Found {len(all_posts)} discussions about '{q}'. The community sentiment is {overall_tone.lower()} with {positive_count} positive, {negative_count} negative, and {neutral_count} neutral reactions."
-
-        # Ensure accumulated is defined
-        if "accumulated" not in dir():
-            accumulated = f"Found {len(all_posts)} discussions about '{q}'. The community sentiment is {overall_tone.lower()} with {positive_count} positive, {negative_count} negative, and {neutral_count} neutral reactions."
 
-        # Send final complete event
-        yield f"event: complete\ndata: {
-            json.dumps(
-                {
-                    'query': q,
-                    'summary': accumulated
-                    if 'accumulated' in dir()
-                    else f"Found {len(all_posts)} discussions about '{q}'.",
-                    'sentiment_summary': {
-                        'positive': positive_count,
-                        'neutral': neutral_count,
-                        'negative': negative_count,
-                        'total': total,
-                        'positive_percent': round(positive_percent, 1),
-                        'negative_percent': round(negative_percent, 1),
-                        'overall_tone': overall_tone,
-                    },
-                    'positive_examples': positive_examples,
-                    'negative_examples': negative_examples,
-                    'neutral_examples': neutral_examples,
-                }
-            )
-        }\n\n"
+        if not accumulated:
+            accumulated = fallback_summary(analysis)
+
+        # Send final complete event, assembled from the pre-encoded fragments
+        # (examples_bytes[1:] drops its opening brace to join the objects)
+        yield sse_raw(
+            "complete",
+            b'{"query":' + orjson.dumps(q)
+            + b',"summary":' + orjson.dumps(accumulated)
+            + b',"sentiment_summary":' + stats_bytes
+            + b"," + examples_bytes[1:],
+        )
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
 
 
-async def generate_topic_summary(
-    query: str, posts: List[Post], positive: int, negative: int, neutral: int, tone: str
-) -> str:
+async def generate_topic_summary(analysis: TopicAnalysis) -> str:
     """Generate an AI summary of what people are saying about a topic"""
 
-    if not posts:
-        return f"No discussions found about '{query}'."
+    if analysis.total == 0:
+        return f"No discussions found about '{analysis.query}'."
 
-    # Get content snippets from top posts
-    snippets = []
-    for post in posts[:10]:
-        content = f"Title: {post.title}\nContent: {post.selftext[:200] if post.selftext else 'N/A'}"
-        snippets.append(content)
-
-    content_text = "\n---\n".join(snippets)
-
-    prompt = f"""Analyze Reddit discussions about "{query}".
-
-Stats: {positive_count} positive, {negative_count} negative, {neutral_count} neutral posts. Overall tone: {overall_tone}.
-
-Recent posts:
-{content_text}
-
-Write a 2-3 sentence summary of what people are discussing and their general sentiment. Be concise and factual."""
+    prompt = build_summary_prompt(analysis)
 
     try:
         payload = {
@@ -1433,27 +1641,27 @@ Write a 2-3 sentence summary of what people are discussing and their general sen
             "temperature": 0.3,
             "max_tokens": 150,
             "stop": ["<|im_end|>"],
+            "cache_prompt": True,
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{LLAMA_SERVER_URL}/completion",
-                json=payload,
-                timeout=aiohttp.ClientTimeout(total=30),
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    content = result.get("content", "").strip()
-                    # Clean up the response
-                    content = content.replace("<|im_start|>", "").replace("<|im_end|>", "").strip()
-                    if content:
-                        return content
+        session = get_http_session()
+        async with _summary_semaphore, session.post(
+            f"{LLAMA_SERVER_URL}/completion",
+            json=payload,
+            timeout=aiohttp.ClientTimeout(total=30),
+        ) as response:
+            if response.status == 200:
+                result = await response.json()
+                content = result.get("content", "").strip()
+                # Clean up the response
+                content = content.replace("<|im_start|>", "").replace("<|im_end|>", "").strip()
+                if content:
+                    return content
 
     except Exception as e:
         print(f"Error generating summary: {e}")
 
-    # Fallback summary
-    return f"Found {len(posts)} discussions about '{query}'. The community sentiment is {tone.lower()} with {positive} positive, {negative} negative, and {neutral} neutral reactions. People seem to be discussing {query} with varied opinions."
+    return fallback_summary(analysis)
 
 
 @app.get("/api/posts", response_model=List[Post])
@@ -1464,53 +1672,76 @@ async def get_posts(
     sentiment: Optional[str] = None,
 ):
     """Get posts with optional filtering"""
-    conn = sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
-    cursor = conn.cursor()
+    return await asyncio.to_thread(query_posts, subreddit, days, limit, sentiment)
+
+
+# Constant SQL text for the hot read queries. sqlite3 keys its per-connection
+# statement cache on the literal SQL, so keeping the text identical on every
+# call reuses the prepared plan instead of re-parsing; the optional filters
+# collapse through "(:param IS NULL OR ...)" instead of string splicing.
+_POSTS_SQL = """
+    SELECT id, title, selftext_snippet AS selftext, author, score, ups, downs, num_comments,
+           created_utc, permalink, url, subreddit, sentiment, sentiment_score, analyzed_at
+    FROM posts
+    WHERE (:sub IS NULL OR subreddit = :sub)
+      AND created_utc > :cutoff
+      AND (:sent IS NULL OR sentiment = :sent)
+    ORDER BY created_utc DESC
+    LIMIT :limit
+"""
 
-    cutoff = datetime.now() - timedelta(days=days)
+_DISTRIBUTION_SQL = """
+    SELECT sentiment, COUNT(*) FROM posts
+    WHERE (:sub IS NULL OR subreddit = :sub)
+      AND created_utc > :cutoff AND sentiment IS NOT NULL
+    GROUP BY sentiment
+"""
 
-    # If subreddit is specified (not "all"), filter by it
-    if subreddit and subreddit.lower() != "all":
-        query = "SELECT * FROM posts WHERE subreddit = ? AND created_utc > ?"
-        params: list[Any] = [subreddit, cutoff]
-    else:
-        # Return posts from all subreddits
-        query = "SELECT * FROM posts WHERE created_utc > ?"
-        params = [cutoff]
+_TIMELINE_SQL = """
+    WITH RECURSIVE dates(d) AS (
+        SELECT date(:start)
+        UNION ALL
+        SELECT date(d, '+1 day') FROM dates WHERE d < date('now', 'localtime')
+    )
+    SELECT d,
+           SUM(CASE WHEN sentiment = 'positive' THEN 1 ELSE 0 END),
+           SUM(CASE WHEN sentiment = 'neutral' THEN 1 ELSE 0 END),
+           SUM(CASE WHEN sentiment = 'negative' THEN 1 ELSE 0 END)
+    FROM dates
+    LEFT JOIN posts ON DATE(posts.created_utc) = dates.d
+        AND posts.created_utc > :cutoff AND posts.sentiment IS NOT NULL
+        AND (:sub IS NULL OR posts.subreddit = :sub)
+    GROUP BY d
+    ORDER BY d
+"""
 
-    if sentiment:
-        query += " AND sentiment = ?"
-        params.append(sentiment)
 
-    query += " ORDER BY created_utc DESC LIMIT ?"
-    params.append(limit)
+def _subreddit_param(subreddit: Optional[str]) -> Optional[str]:
+    """Normalize the "all"/empty subreddit filter to NULL for the constant SQL"""
+    return subreddit if subreddit and subreddit.lower() != "all" else None
 
-    cursor.execute(query, params)
 
-    posts = []
-    for row in cursor.fetchall():
-        posts.append(
-            Post(
-                id=row[0],
-                title=row[1],
-                selftext=row[2],
-                author=row[3],
-                score=row[4],
-                ups=row[5],
-                downs=row[6],
-                num_comments=row[7],
-                created_utc=row[8],
-                permalink=row[9],
-                url=row[10],
-                subreddit=row[11],
-                sentiment=row[12],
-                sentiment_score=row[13],
-                analyzed_at=row[14],
-            )
-        )
+def query_posts(
+    subreddit: Optional[str], days: int, limit: int, sentiment: Optional[str]
+) -> List[Post]:
+    """Synchronous body of /api/posts (runs on a worker thread)"""
+    cursor = get_read_conn().cursor()
+    cursor.row_factory = sqlite3.Row
 
-    conn.close()
-    return posts
+    cutoff = datetime.now() - timedelta(days=days)
+
+    cursor.execute(
+        _POSTS_SQL,
+        {
+            "sub": _subreddit_param(subreddit),
+            "cutoff": cutoff,
+            "sent": sentiment or None,
+            "limit": limit,
+        },
+    )
+
+    # Rows come from our own DB: skip per-field Pydantic validation
+    return [Post.model_construct(**dict(row)) for row in cursor]
 
 
 @app.get("/api/sentiment/distribution", response_model=SentimentDistribution)
@@ -1518,37 +1749,24 @@ async def get_distribution(
     subreddit: Optional[str] = Query(None),
     days: int = Query(7),
 ):
-    """Get sentiment distribution"""
-    conn = sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
-    cursor = conn.cursor()
+    """Get sentiment distribution (cached for SENTIMENT_CACHE_TTL_SECONDS)"""
+    key = ("distribution", subreddit, days)
+    return await _cached_sentiment_query(key, query_distribution, subreddit, days)
+
+
+def query_distribution(subreddit: Optional[str], days: int) -> SentimentDistribution:
+    """Synchronous body of /api/sentiment/distribution (runs on a worker thread)"""
+    cursor = get_read_conn().cursor()
 
     cutoff = datetime.now() - timedelta(days=days)
 
-    if subreddit and subreddit.lower() != "all":
-        cursor.execute(
-            """
-            SELECT sentiment, COUNT(*) FROM posts 
-            WHERE subreddit = ? AND created_utc > ? AND sentiment IS NOT NULL
-            GROUP BY sentiment
-        """,
-            (subreddit, cutoff),
-        )
-    else:
-        cursor.execute(
-            """
-            SELECT sentiment, COUNT(*) FROM posts 
-            WHERE created_utc > ? AND sentiment IS NOT NULL
-            GROUP BY sentiment
-        """,
-            (cutoff,),
-        )
+    cursor.execute(_DISTRIBUTION_SQL, {"sub": _subreddit_param(subreddit), "cutoff": cutoff})
 
     distribution = {"positive": 0, "neutral": 0, "negative": 0}
     for sentiment, count in cursor.fetchall():
         if sentiment and sentiment.lower() in distribution:
             distribution[sentiment.lower()] = count
 
-    conn.close()
     return SentimentDistribution(**distribution)
 
 
@@ -1557,56 +1775,32 @@ async def get_timeline(
     subreddit: Optional[str] = Query(None),
     days: int = Query(7),
 ):
-    """Get sentiment over time"""
-    conn = sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
-    cursor = conn.cursor()
+    """Get sentiment over time (cached for SENTIMENT_CACHE_TTL_SECONDS)"""
+    key = ("timeline", subreddit, days)
+    return await _cached_sentiment_query(key, query_timeline, subreddit, days)
 
-    cutoff = datetime.now() - timedelta(days=days)
-
-    if subreddit and subreddit.lower() != "all":
-        cursor.execute(
-            """
-            SELECT DATE(created_utc) as date, sentiment, COUNT(*)
-            FROM posts 
-            WHERE subreddit = ? AND created_utc > ? AND sentiment IS NOT NULL
-            GROUP BY DATE(created_utc), sentiment
-            ORDER BY date DESC
-        """,
-            (subreddit, cutoff),
-        )
-    else:
-        cursor.execute(
-            """
-            SELECT DATE(created_utc) as date, sentiment, COUNT(*)
-            FROM posts 
-            WHERE created_utc > ? AND sentiment IS NOT NULL
-            GROUP BY DATE(created_utc), sentiment
-            ORDER BY date DESC
-        """,
-            (cutoff,),
-        )
 
-    date_data = {}
-    for date, sentiment, count in cursor.fetchall():
-        if date not in date_data:
-            date_data[date] = {"positive": 0, "neutral": 0, "negative": 0}
-        if sentiment and sentiment.lower() in date_data[date]:
-            date_data[date][sentiment.lower()] = count
+def query_timeline(subreddit: Optional[str], days: int) -> TimelineData:
+    """Synchronous body of /api/sentiment/timeline (runs on a worker thread)"""
+    cursor = get_read_conn().cursor()
 
-    conn.close()
+    cutoff = datetime.now() - timedelta(days=days)
 
-    labels = []
-    positive = []
-    neutral = []
-    negative = []
+    # SQLite generates the dense date series and pivots the per-day sentiment
+    # counts with conditional aggregation; Python just unzips the result
+    cursor.execute(
+        _TIMELINE_SQL,
+        {
+            "start": cutoff.date().isoformat(),
+            "cutoff": cutoff,
+            "sub": _subreddit_param(subreddit),
+        },
+    )
+    rows = cursor.fetchall()
 
-    for i in range(days - 1, -1, -1):
-        date = (cutoff + timedelta(days=i)).strftime("%Y-%m-%d")
-        labels.append(date)
-        data = date_data.get(date, {"positive": 0, "neutral": 0, "negative": 0})
-        positive.append(data["positive"])
-        neutral.append(data["neutral"])
-        negative.append(data["negative"])
+    labels, positive, neutral, negative = [], [], [], []
+    if rows:
+        labels, positive, neutral, negative = (list(col) for col in zip(*rows, strict=True))
 
     return TimelineData(labels=labels, positive=positive, neutral=neutral, negative=negative)
 
@@ -1615,9 +1809,39 @@ async def get_timeline(
 async def trigger_analysis(subreddit: str = "LocalLLaMA", limit: int = 25):
     """Manually trigger analysis for a subreddit"""
     analyzed = await fetch_and_analyze_subreddit(subreddit)
+    if analyzed > 0:
+        invalidate_stats_cache()
+        invalidate_sentiment_cache()
     return {"message": f"Analyzed {analyzed} posts", "subreddit": subreddit}
 
 
+@app.get("/api/posts/{post_id}", response_model=Post)
+async def get_post(post_id: str):
+    """Get a single post including its full selftext"""
+    post = await asyncio.to_thread(query_post, post_id)
+    if post is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+    return post
+
+
+def query_post(post_id: str) -> Optional[Post]:
+    """Synchronous body of /api/posts/{post_id} (runs on a worker thread)"""
+    cursor = get_read_conn().cursor()
+    cursor.row_factory = sqlite3.Row
+
+    cursor.execute(
+        """
+        SELECT id, title, selftext, author, score, ups, downs, num_comments,
+               created_utc, permalink, url, subreddit, sentiment, sentiment_score, analyzed_at
+        FROM posts WHERE id = ?
+    """,
+        (post_id,),
+    )
+    row = cursor.fetchone()
+
+    return Post.model_construct(**dict(row)) if row else None
+
+
 @app.get("/api/posts/{post_id}/comments")
 async def get_post_comments(
     post_id: str,
@@ -1626,9 +1850,9 @@ async def get_post_comments(
 ):
     """Get comments for a post. Use tree=true for nested structure."""
     if tree:
-        comments = get_comments_tree(post_id, max_depth=3, max_per_level=limit)
+        comments = await asyncio.to_thread(get_comments_tree, post_id, 3, limit)
     else:
-        comments = get_comments_for_post(post_id, limit=limit)
+        comments = await asyncio.to_thread(get_comments_for_post, post_id, limit)
 
     return {
         "post_id": post_id,
@@ -1640,7 +1864,7 @@ async def get_post_comments(
 @app.get("/api/posts/{post_id}/comments/stats")
 async def get_comment_stats_endpoint(post_id: str):
     """Get sentiment statistics for comments on a post"""
-    stats = get_comment_stats(post_id)
+    stats = await asyncio.to_thread(get_comment_stats, post_id)
     return {
         "post_id": post_id,
         "total": stats["total"],
@@ -1660,23 +1884,18 @@ async def trigger_comment_analysis(
     max_depth: int = Query(2, ge=1, le=5),
 ):
     """Fetch and analyze comments for a post"""
-    conn = sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
-    cursor = conn.cursor()
-
-    cursor.execute("SELECT id, title, subreddit FROM posts WHERE id = ?", (post_id,))
-    row = cursor.fetchone()
-    conn.close()
+    existing = await asyncio.to_thread(query_post, post_id)
 
-    if not row:
+    if existing is None:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    post = {"id": row[0], "title": row[1], "subreddit": row[2]}
+    post = {"id": existing.id, "title": existing.title, "subreddit": existing.subreddit}
 
     analyzed = await analyze_and_store_comments(
         post, max_depth=max_depth, max_comments=max_comments
     )
 
-    stats = get_comment_stats(post_id)
+    stats = await asyncio.to_thread(get_comment_stats, post_id)
 
     return {
         "message": f"Analyzed {analyzed} comments",
@@ -120,6 +120,9 @@ fi
 # Add performance optimizations
 LAUNCH_CMD="$LAUNCH_CMD -t $(nproc)"
 
+# Continuous batching: coalesce the API's concurrent sentiment requests
+LAUNCH_CMD="$LAUNCH_CMD --parallel 16 --cont-batching"
+
 echo -e "${BLUE}Launching server with command:${NC}"
 echo -e "${YELLOW}$LAUNCH_CMD${NC}"
 echo ""
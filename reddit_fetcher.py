@@ -4,62 +4,96 @@ Reddit Sentiment Analysis - Data Fetcher
 Fetches posts from r/LocalLLaMA using Reddit's JSON API
 """
 
-import urllib.request
+import asyncio
 import json
+from dataclasses import asdict, dataclass
 from datetime import datetime
-from urllib.parse import urlencode
 
+import aiohttp
+import orjson
 
-def fetch_subreddit(subreddit, limit=25):
+# Shared session: one connection pool with keep-alives, so concurrent
+# subreddit fetches via asyncio.gather reuse TCP/TLS instead of paying
+# setup per request
+_session = None
+
+
+def get_session():
+    """Return the shared aiohttp session, creating it lazily if needed"""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            headers={"User-Agent": "SentimentAnalysisBot/1.0 (Educational Purpose)"},
+            timeout=aiohttp.ClientTimeout(total=15),
+            connector=aiohttp.TCPConnector(limit=10, keepalive_timeout=75),
+        )
+    return _session
+
+
+async def fetch_subreddit(subreddit, limit=25):
     """Fetch posts from a subreddit using the .json endpoint"""
-    params = {"limit": limit}
-    url = f"https://www.reddit.com/r/{subreddit}.json?{urlencode(params)}"
-    headers = {"User-Agent": "SentimentAnalysisBot/1.0 (Educational Purpose)"}
+    url = f"https://www.reddit.com/r/{subreddit}.json"
+    async with get_session().get(url, params={"limit": limit}) as response:
+        response.raise_for_status()
+        # orjson parses the raw bytes directly; no intermediate str decode
+        return orjson.loads(await response.read())
+
 
-    req = urllib.request.Request(url, headers=headers)
-    with urllib.request.urlopen(req) as response:
-        return json.loads(response.read().decode("utf-8"))
+@dataclass(slots=True)
+class RedditPost:
+    """One parsed post; slots avoid per-post dict overhead"""
+
+    id: str
+    title: str
+    selftext: str
+    author: str
+    score: int
+    ups: int
+    downs: int
+    num_comments: int
+    created_utc: datetime
+    permalink: str
+    url: str
+    subreddit: str
 
 
 def parse_posts(data):
     """Extract relevant fields from Reddit JSON response"""
-    posts = []
-    for child in data["data"]["children"]:
-        post_data = child["data"]
-        posts.append(
-            {
-                "id": post_data["id"],
-                "title": post_data["title"],
-                "selftext": post_data.get("selftext", ""),
-                "author": post_data["author"],
-                "score": post_data["score"],
-                "ups": post_data["ups"],
-                "downs": post_data["downs"],
-                "num_comments": post_data["num_comments"],
-                "created_utc": datetime.fromtimestamp(post_data["created_utc"]),
-                "permalink": f"https://reddit.com{post_data['permalink']}",
-                "url": post_data.get("url", ""),
-                "subreddit": post_data["subreddit"],
-            }
+    return [
+        RedditPost(
+            id=d["id"],
+            title=d["title"],
+            selftext=d.get("selftext", ""),
+            author=d["author"],
+            score=d["score"],
+            ups=d["ups"],
+            downs=d["downs"],
+            num_comments=d["num_comments"],
+            created_utc=datetime.fromtimestamp(d["created_utc"]),
+            permalink=f"https://reddit.com{d['permalink']}",
+            url=d.get("url", ""),
+            subreddit=d["subreddit"],
         )
-    return posts
+        for child in data["data"]["children"]
+        for d in (child["data"],)
+    ]
 
 
 def display_posts(posts):
     """Display fetched posts in a readable format"""
-    print(f"\nFetched {len(posts)} posts from r/{posts[0]['subreddit']}\n")
+    print(f"\nFetched {len(posts)} posts from r/{posts[0].subreddit}\n")
     print("=" * 80)
 
     for i, post in enumerate(posts, 1):
-        print(f"\n[{i}] {post['title']}")
+        print(f"\n[{i}] {post.title}")
         print(
-            f"    Author: u/{post['author']} | Score: {post['score']} | Comments: {post['num_comments']}"
+            f"    Author: u/{post.author} | Score: {post.score} | Comments: {post.num_comments}"
         )
-        print(f"    Posted: {post['created_utc'].strftime('%Y-%m-%d %H:%M')}")
-        print(f"    URL: {post['permalink']}")
+        print(f"    Posted: {post.created_utc.strftime('%Y-%m-%d %H:%M')}")
+        print(f"    URL: {post.permalink}")
 
         # Show first 200 chars of content if available
-        content = post["selftext"] or post["url"]
+        content = post.selftext or post.url
         if content:
             preview = content[:200].replace("\n", " ")
             if len(content) > 200:
@@ -68,11 +102,11 @@ def display_posts(posts):
         print("-" * 80)
 
 
-if __name__ == "__main__":
+async def main():
     print("Fetching posts from r/LocalLLaMA...")
 
     try:
-        data = fetch_subreddit("LocalLLaMA", limit=10)
+        data = await fetch_subreddit("LocalLLaMA", limit=10)
         posts = parse_posts(data)
         display_posts(posts)
 
@@ -82,7 +116,7 @@ if __name__ == "__main__":
                 [
                     {
                         k: str(v) if isinstance(v, datetime) else v
-                        for k, v in post.items()
+                        for k, v in asdict(post).items()
                     }
                     for post in posts
                 ],
@@ -93,3 +127,10 @@ if __name__ == "__main__":
 
     except Exception as e:
         print(f"Error: {e}")
+
+    finally:
+        await get_session().close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())